@@ -22,9 +22,9 @@ def fix_model_file(input_file, output_file):
         
         print(f"   ✅ Loaded successfully! Type: {type(data)}")
         
-        # Save using joblib
+        # Save uncompressed with protocol 5 so it can be loaded with mmap_mode="r"
         print(f"   💾 Saving to {output_file}...")
-        joblib.dump(data, output_file)
+        joblib.dump(data, output_file, compress=0, protocol=5)
         
         print(f"   ✅ Successfully converted to {output_file}")
         return True
@@ -42,7 +42,7 @@ def test_model_file(filename):
         return False
     
     try:
-        model = joblib.load(filename)
+        model = joblib.load(filename, mmap_mode="r")
         print(f"   ✅ Loaded successfully!")
         print(f"   📊 Type: {type(model)}")
         print(f"   📋 Class: {model.__class__.__name__}")
@@ -7,16 +7,16 @@ def load_all_models():
     models = {}
 
     try:
-        models["model"] = joblib.load(BASE_DIR / "best_model.pkl")
+        models["model"] = joblib.load(BASE_DIR / "best_model.pkl", mmap_mode="r")
         print("✅ best_model.pkl loaded")
 
-        models["selector"] = joblib.load(BASE_DIR / "feature_selector.pkl")
+        models["selector"] = joblib.load(BASE_DIR / "feature_selector.pkl", mmap_mode="r")
         print("✅ feature_selector.pkl loaded")
 
-        models["scaler"] = joblib.load(BASE_DIR / "scaler.pkl")
+        models["scaler"] = joblib.load(BASE_DIR / "scaler.pkl", mmap_mode="r")
         print("✅ scaler.pkl loaded")
 
-        models["gnn_output"] = joblib.load(BASE_DIR / "output_of_GNN_model.pkl")
+        models["gnn_output"] = joblib.load(BASE_DIR / "output_of_GNN_model.pkl", mmap_mode="r")
         print("✅ output_of_GNN_model.pkl loaded")
 
     except Exception as e:
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import pandas as pd
@@ -7,10 +7,23 @@ import datetime
 import os
 import joblib
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sklearn.linear_model import LogisticRegression
 from typing import Optional, List
 import logging
 from pathlib import Path
 import io
+import json
+import itertools
+import time
+import threading
+from functools import lru_cache
+
+try:
+    from numba import njit  # pyright: ignore[reportMissingImports]
+except ImportError:
+    njit = None
 
 # ======================================
 # LOGGING
@@ -21,7 +34,7 @@ logger = logging.getLogger("main")
 # ======================================
 # FASTAPI SETUP
 # ======================================
-app = FastAPI(title="AI-Powered KYC Verification API")
+app = FastAPI(title="AI-Powered KYC Verification API", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -39,7 +52,23 @@ MODEL_PATH = BASE_DIR / "best_model.pkl"
 SCALER_PATH = BASE_DIR / "scaler.pkl"
 FEATURE_SELECTOR_PATH = BASE_DIR / "feature_selector.pkl"
 GNN_CSV = BASE_DIR / "output_of_GNN_part2.csv"
-AUDIT_LOG = BASE_DIR / "kyc_audit_log.csv"
+AUDIT_DIR = BASE_DIR / "audit_parquet"
+AUDIT_SCHEMA = pa.schema([
+    ("Timestamp", pa.string()),
+    ("Name", pa.string()),
+    ("ID_Type", pa.string()),
+    ("ID_Type_Raw", pa.string()),
+    ("Document_Number", pa.string()),
+    ("Fraud_Risk", pa.string()),
+    ("Fraud_Probability", pa.float64()),
+])
+AUDIT_FLUSH_EVERY = 100
+AUDIT_FLUSH_SECONDS = 60
+# Upper bound on rows kept in memory while writes keep failing; oldest are dropped first
+AUDIT_MAX_BUFFERED = 10000
+# ID_Type is the partition key, so client-supplied values are folded into a fixed set
+AUDIT_ID_TYPES = {"AADHAR", "PAN", "PASSPORT", "UTILITY"}
+WARMUP = os.getenv("WARMUP", "1") == "1"
 
 # ======================================
 # GLOBALS
@@ -47,7 +76,21 @@ AUDIT_LOG = BASE_DIR / "kyc_audit_log.csv"
 model = None
 scaler = None
 feature_selector = None
+sel_mask = None
+sel_skip = False
+scl_mean = None
+scl_scale = None
+fast_params = None
+predict_prob_fn = None
 gnn_df = pd.DataFrame()
+gnn_lookup = {}
+gnn_df_empty = True
+audit_rows = []
+audit_flush_failed = False
+audit_dropped = 0
+audit_lock = threading.Lock()
+audit_stop = threading.Event()
+audit_thread = None
 
 # ======================================
 # REQUEST MODELS
@@ -108,34 +151,173 @@ def ensure_gnn_csv():
 # ======================================
 # LOAD MODELS
 # ======================================
+def uses_memmap(obj):
+    """True if any numpy array attribute of obj is backed by a numpy.memmap."""
+    for value in getattr(obj, "__dict__", {}).values():
+        if isinstance(value, np.memmap):
+            return True
+        if isinstance(value, np.ndarray) and isinstance(value.base, np.memmap):
+            return True
+    return False
+
 def load_models():
     global model, scaler, feature_selector
     try:
-        model = joblib.load(MODEL_PATH)
-        logger.info("✅ Loaded ML model")
+        model = joblib.load(MODEL_PATH, mmap_mode="r")
+        logger.info(f"✅ Loaded ML model (memmap: {uses_memmap(model)})")
     except Exception as e:
         logger.error(f"❌ Model load failed: {e}")
         model = None
 
     try:
-        scaler = joblib.load(SCALER_PATH)
-        logger.info("✅ Loaded scaler")
+        scaler = joblib.load(SCALER_PATH, mmap_mode="r")
+        logger.info(f"✅ Loaded scaler (memmap: {uses_memmap(scaler)})")
     except Exception as e:
         logger.error(f"❌ Scaler load failed: {e}")
         scaler = None
 
     try:
-        feature_selector = joblib.load(FEATURE_SELECTOR_PATH)
-        logger.info("✅ Loaded feature selector")
+        feature_selector = joblib.load(FEATURE_SELECTOR_PATH, mmap_mode="r")
+        logger.info(f"✅ Loaded feature selector (memmap: {uses_memmap(feature_selector)})")
     except Exception as e:
         logger.error(f"❌ Feature selector load failed: {e}")
         feature_selector = None
 
+    prepare_predict_fn()
+
+def prepare_predict_fn():
+    """Resolve how to get a fraud probability column from the loaded model once, not per request."""
+    global predict_prob_fn
+    predict_prob_fn = None
+    if not model:
+        return
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba
+        n_classes = len(getattr(model, "classes_", ()))
+        col = 1 if n_classes == 2 else 0 if n_classes == 1 else -1
+        predict_prob_fn = lambda X: proba(X)[:, col]
+    elif hasattr(model, "decision_function"):
+        decision = model.decision_function
+        predict_prob_fn = lambda X: 1.0 / (1.0 + np.exp(-np.ravel(decision(X))))
+    else:
+        logger.warning("Model has neither predict_proba nor decision_function, using GNN fallback")
+
+# ======================================
+# PRECOMPUTED SELECTOR / SCALER
+# ======================================
+def prepare_transform():
+    """Pull the selector mask and scaler affine out once so requests skip sklearn's transform() overhead."""
+    global sel_mask, sel_skip, scl_mean, scl_scale
+    sel_mask = None
+    sel_skip = False
+    scl_mean = None
+    scl_scale = None
+    if feature_selector:
+        n_in = getattr(feature_selector, "n_features_in_", N_FEATURES)
+        if n_in != N_FEATURES:
+            # transform() would raise on every request and leave X unchanged, so skip it up front
+            logger.warning(f"⚠️ Feature selector expects {n_in} features, extract_features gives {N_FEATURES}; skipping selector")
+            sel_skip = True
+        elif hasattr(feature_selector, "get_support"):
+            try:
+                sel_mask = np.asarray(feature_selector.get_support(), dtype=bool)
+            except Exception as e:
+                logger.warning(f"Could not precompute selector mask: {e}")
+    if scaler and hasattr(scaler, "scale_") and hasattr(scaler, "mean_"):
+        n_in = scaler.n_features_in_
+        mean = scaler.mean_ if getattr(scaler, "with_mean", True) and scaler.mean_ is not None else np.zeros(n_in)
+        scale = scaler.scale_ if getattr(scaler, "with_std", True) and scaler.scale_ is not None else np.ones(n_in)
+        scl_mean = np.asarray(mean, dtype=np.float32)
+        scl_scale = np.asarray(scale, dtype=np.float32)
+    logger.info(f"Inline selector: {sel_mask is not None}, inline scaler: {scl_mean is not None}")
+
+def transform_features(X):
+    if feature_selector and not sel_skip:
+        if sel_mask is not None:
+            X = X[:, sel_mask]
+        else:
+            try:
+                X = feature_selector.transform(X)
+            except Exception as e:
+                logger.warning(f"Feature selector failed: {e}")
+    if scaler:
+        if scl_mean is not None and X.shape[1] == scl_mean.shape[0]:
+            X = (X - scl_mean) / scl_scale
+        else:
+            try:
+                X = scaler.transform(X)
+            except Exception as e:
+                logger.warning(f"Scaler failed: {e}")
+    return X
+
+# ======================================
+# NUMBA FAST PATH (LOGISTIC REGRESSION)
+# ======================================
+def _linear_prob(x, mask, mean, scale, coef, intercept):
+    z = intercept
+    j = 0
+    for i in range(x.shape[0]):
+        if mask[i]:
+            z += (x[i] - mean[j]) / scale[j] * coef[j]
+            j += 1
+    return 1.0 / (1.0 + np.exp(-z))
+
+def _linear_prob_batch(X, mask, mean, scale, coef, intercept):
+    out = np.empty(X.shape[0], dtype=np.float64)
+    for r in range(X.shape[0]):
+        z = intercept
+        j = 0
+        for i in range(X.shape[1]):
+            if mask[i]:
+                z += (X[r, i] - mean[j]) / scale[j] * coef[j]
+                j += 1
+        out[r] = 1.0 / (1.0 + np.exp(-z))
+    return out
+
+if njit is not None:
+    linear_prob = njit(cache=True)(_linear_prob)
+    linear_prob_batch = njit(cache=True)(_linear_prob_batch)
+else:
+    linear_prob = linear_prob_batch = None
+
+def prepare_fast_model():
+    """Fold selector mask, scaler and a binary LogisticRegression into one numba kernel's inputs."""
+    global fast_params
+    fast_params = None
+    if linear_prob is None or linear_prob_batch is None:
+        return
+    if not isinstance(model, LogisticRegression) or len(model.classes_) != 2:
+        return
+    if getattr(model, "multi_class", "auto") == "multinomial":
+        return
+    if feature_selector and not sel_skip and sel_mask is None:
+        return
+    # No selector, or one skipped at load for a width mismatch, keeps all 12 features
+    mask = sel_mask if sel_mask is not None else np.ones(N_FEATURES, dtype=bool)
+    n_selected = int(mask.sum())
+    if scaler:
+        if scl_mean is None or scl_mean.shape[0] != n_selected:
+            return
+        mean, scale = scl_mean, scl_scale
+    else:
+        mean, scale = np.zeros(n_selected, dtype=np.float32), np.ones(n_selected, dtype=np.float32)
+    coef = np.asarray(model.coef_[0], dtype=np.float32)
+    if coef.shape[0] != n_selected:
+        return
+    fast_params = (mask, mean, scale, coef, np.float32(model.intercept_[0]))
+    try:
+        linear_prob(np.zeros(N_FEATURES, dtype=np.float32), *fast_params)
+        linear_prob_batch(np.zeros((1, N_FEATURES), dtype=np.float32), *fast_params)
+        logger.info("✅ Numba fast path enabled")
+    except Exception as e:
+        logger.warning(f"Numba fast path disabled: {e}")
+        fast_params = None
+
 # ======================================
 # LOAD GNN OUTPUT CSV
 # ======================================
 def load_gnn():
-    global gnn_df
+    global gnn_df, gnn_lookup, gnn_df_empty
     try:
         if not GNN_CSV.exists():
             logger.warning("⚠️ GNN CSV not found. Creating new...")
@@ -150,26 +332,165 @@ def load_gnn():
     except Exception as e:
         logger.error(f"❌ Error loading GNN CSV: {e}")
         gnn_df = pd.DataFrame()
+    gnn_lookup = {}
+    if not gnn_df.empty:
+        try:
+            probs = pd.Series(
+                pd.to_numeric(gnn_df["GNN_Fraud_Probability"], errors="coerce").to_numpy(dtype=float),
+                index=gnn_df["Document_Number"].astype(str).to_numpy(),
+            ).dropna()
+            # First row wins for duplicate document numbers, as with the old mask lookup
+            gnn_lookup = probs[~probs.index.duplicated(keep="first")].to_dict()
+            logger.info(f"✅ Indexed {len(gnn_lookup)} GNN document numbers")
+        except Exception as e:
+            logger.error(f"❌ Error indexing GNN CSV: {e}")
+            gnn_lookup = {}
+    gnn_df_empty = not gnn_lookup
+
+# ======================================
+# AUDIT LOG
+# ======================================
+def audit_id_type(dtype):
+    value = str(dtype or "").strip().upper()
+    return value if value in AUDIT_ID_TYPES else "OTHER"
+
+def _audit_text(value):
+    # Lone surrogates are valid JSON escapes but not encodable as UTF-8
+    return str(value).encode("utf-8", "backslashreplace").decode("utf-8")
+
+def _audit_table(rows):
+    ts, names, dtypes, docs, risks, probs = zip(*rows)
+    columns = [ts, names, [audit_id_type(d) for d in dtypes], dtypes, docs, risks, probs]
+    return pa.Table.from_arrays(
+        [pa.array(list(col), type=field.type) for col, field in zip(columns, AUDIT_SCHEMA)],
+        schema=AUDIT_SCHEMA,
+    )
+
+def _clean_audit_rows(rows):
+    """Sanitize rows pyarrow cannot encode; drop the ones that still fail."""
+    clean = []
+    for row in rows:
+        try:
+            _audit_table([row])
+        except Exception:
+            row = [v if isinstance(v, float) else _audit_text(v) for v in row]
+            try:
+                _audit_table([row])
+            except Exception as e:
+                logger.error(f"❌ Dropping audit row that cannot be encoded: {e}")
+                continue
+        clean.append(row)
+    return clean
+
+def _flush_audit_rows():
+    """Write buffered rows; on failure they stay buffered for the next attempt."""
+    global audit_rows, audit_flush_failed
+    if not audit_rows:
+        return True
+    try:
+        table = _audit_table(audit_rows)
+    except Exception as e:
+        # A single bad row must not block the whole buffer on every retry
+        logger.warning(f"⚠️ Audit rows failed to encode, checking them one by one: {e}")
+        audit_rows = _clean_audit_rows(audit_rows)
+        if not audit_rows:
+            return True
+        table = _audit_table(audit_rows)
+    try:
+        pq.write_to_dataset(table, root_path=AUDIT_DIR, partition_cols=["ID_Type"])
+    except Exception as e:
+        logger.error(f"❌ Audit flush failed, keeping {len(audit_rows)} rows for retry: {e}")
+        audit_flush_failed = True
+        return False
+    audit_rows = []
+    audit_flush_failed = False
+    return True
+
+def prepare_audit_log():
+    # Create the dataset root once so the first flush does not pay for it
+    AUDIT_DIR.mkdir(parents=True, exist_ok=True)
+
+def write_audit_rows(rows):
+    global audit_dropped
+    with audit_lock:
+        audit_rows.extend(rows)
+        overflow = len(audit_rows) - AUDIT_MAX_BUFFERED
+        if overflow > 0:
+            del audit_rows[:overflow]
+            audit_dropped += overflow
+            logger.error(f"❌ Audit buffer full, dropped {overflow} oldest rows ({audit_dropped} total)")
+        # After a failed write, leave retries to the timer instead of retrying on every request
+        if len(audit_rows) >= AUDIT_FLUSH_EVERY and not audit_flush_failed:
+            _flush_audit_rows()
+
+def flush_audit_log():
+    with audit_lock:
+        return _flush_audit_rows()
+
+def _audit_flusher():
+    while not audit_stop.wait(AUDIT_FLUSH_SECONDS):
+        flush_audit_log()
+
+def start_audit_flusher():
+    global audit_thread
+    audit_stop.clear()
+    audit_thread = threading.Thread(target=_audit_flusher, name="audit-flusher", daemon=True)
+    audit_thread.start()
+
+def stop_audit_flusher():
+    audit_stop.set()
+    if audit_thread is not None:
+        audit_thread.join(timeout=5)
+    flush_audit_log()
 
 # ======================================
 # FEATURE EXTRACTION
 # ======================================
+N_FEATURES = 12
+_feature_buf = threading.local()
+
 def extract_features(name, doc, address, dtype):
-    features = [
-        len(name),
-        len(doc),
-        len(address),
-        1 if doc.isdigit() else 0,
-        len(set(doc)),
-        1 if dtype == "AADHAR" else 0,
-        1 if dtype == "PAN" else 0,
-        1 if dtype in ["PASSPORT", "UTILITY"] else 0,
-        len(address.split()),
-        len(name.split()),
-        1 if any(x.isupper() for x in name) else 0,
-        1 if any(x.isdigit() for x in name) else 0,
-    ]
-    return np.array(features).reshape(1, -1)
+    # Reuse one (1, 12) float32 buffer per thread instead of allocating per request;
+    # callers only read it before the next extract_features call on the same thread.
+    buf = getattr(_feature_buf, "X", None)
+    if buf is None:
+        buf = _feature_buf.X = np.empty((1, N_FEATURES), dtype=np.float32)
+    row = buf[0]
+    row[0] = len(name)
+    row[1] = len(doc)
+    row[2] = len(address)
+    row[3] = doc.isdigit()
+    row[4] = len(set(doc))
+    row[5] = dtype == "AADHAR"
+    row[6] = dtype == "PAN"
+    row[7] = dtype in ("PASSPORT", "UTILITY")
+    row[8] = len(address.split())
+    row[9] = len(name.split())
+    row[10] = any(x.isupper() for x in name)
+    row[11] = any(x.isdigit() for x in name)
+    return buf
+
+def extract_features_batch(names, docs, addrs, dtypes):
+    names = pd.Series(names, dtype=object).fillna("").astype(str)
+    docs = pd.Series(docs, dtype=object).fillna("").astype(str)
+    addrs = pd.Series(addrs, dtype=object).fillna("").astype(str)
+    dtypes = pd.Series(dtypes, dtype=object).fillna("").astype(str)
+    return np.column_stack([
+        names.str.len().to_numpy(),
+        docs.str.len().to_numpy(),
+        addrs.str.len().to_numpy(),
+        docs.str.isdigit().to_numpy(np.int64),
+        docs.map(lambda s: len(set(s))).to_numpy(),
+        dtypes.eq("AADHAR").to_numpy(np.int64),
+        dtypes.eq("PAN").to_numpy(np.int64),
+        dtypes.isin(["PASSPORT", "UTILITY"]).to_numpy(np.int64),
+        addrs.str.split().str.len().to_numpy(),
+        names.str.split().str.len().to_numpy(),
+        # Same per-character predicates as extract_features; regex/lower() shortcuts
+        # disagree on titlecase letters and non-decimal digits such as "²"
+        names.map(lambda s: any(x.isupper() for x in s)).to_numpy(np.int64),
+        names.map(lambda s: any(x.isdigit() for x in s)).to_numpy(np.int64),
+    ]).astype(np.float32)
 
 # ======================================
 # RISK LABEL
@@ -181,44 +502,33 @@ def classify(prob):
         return "Medium"
     return "High"
 
+RISK_THRESHOLDS = np.array([0.33, 0.67])
+RISK_LABELS = np.array(["Low", "Medium", "High"])
+
+def classify_batch(probs):
+    # side="right" keeps classify's strict "<" boundaries (0.33 is Medium)
+    return RISK_LABELS[np.searchsorted(RISK_THRESHOLDS, probs, side="right")]
+
 # ======================================
 # GNN FALLBACK
 # ======================================
 def gnn_pred(doc):
-    try:
-        if gnn_df.empty:
-            return 0.50
-        row = gnn_df[gnn_df["Document_Number"].astype(str) == str(doc)]
-        if not row.empty:
-            return float(row.iloc[0]["GNN_Fraud_Probability"])
-    except:
-        pass
-    return 0.50
+    return gnn_lookup.get(str(doc), 0.50)
 
 # ======================================
 # FULL PREDICTION
 # ======================================
-def predict_fraud(name, doc, address, dtype):
+PREDICTION_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def _predict_fraud_cached(name, doc, address, dtype):
     X = extract_features(name, doc, address, dtype)
-    if feature_selector:
+    if fast_params is not None and linear_prob is not None:
+        prob = float(linear_prob(X[0], *fast_params))
+    elif predict_prob_fn is not None:
+        X = transform_features(X)
         try:
-            X = feature_selector.transform(X)
-        except Exception as e:
-            logger.warning(f"Feature selector failed: {e}")
-    if scaler:
-        try:
-            X = scaler.transform(X)
-        except Exception as e:
-            logger.warning(f"Scaler failed: {e}")
-    if model:
-        try:
-            proba_result = model.predict_proba(X)
-            if proba_result.shape[1] == 2:
-                prob = float(proba_result[0][1])
-            elif proba_result.shape[1] == 1:
-                prob = float(proba_result[0][0])
-            else:
-                prob = float(proba_result[0][-1])
+            prob = float(predict_prob_fn(X)[0])
         except Exception as e:
             logger.error(f"Model prediction failed: {e}, using GNN fallback")
             prob = gnn_pred(doc)
@@ -226,13 +536,52 @@ def predict_fraud(name, doc, address, dtype):
         prob = gnn_pred(doc)
     prob = max(0.0, min(1.0, prob))
     risk = classify(prob)
+    return prob * 100, risk, (1 - prob) * 100, "Flagged" if risk == "High" else "Verified"
+
+def predict_fraud(name, doc, address, dtype):
+    prob, risk, confidence, status = _predict_fraud_cached(name, doc, address, dtype)
     return {
-        "fraud_probability": prob * 100,
+        "fraud_probability": prob,
         "risk_level": risk,
-        "confidence": (1 - prob) * 100,
-        "status": "Flagged" if risk == "High" else "Verified"
+        "confidence": confidence,
+        "status": status
+    }
+
+def predict_fraud_batch(names, docs, addresses, dtypes):
+    X = extract_features_batch(names, docs, addresses, dtypes)
+    probs = None
+    if fast_params is not None and linear_prob_batch is not None:
+        probs = linear_prob_batch(X, *fast_params)
+    elif predict_prob_fn is not None:
+        X = transform_features(X)
+        try:
+            probs = predict_prob_fn(X)
+        except Exception as e:
+            logger.error(f"Model prediction failed: {e}, using GNN fallback")
+    if probs is None:
+        probs = np.array([gnn_pred(doc) for doc in docs], dtype=float)
+    probs = np.clip(probs.astype(float), 0.0, 1.0)
+    return probs, classify_batch(probs)
+
+def build_details(address, fraud_probability):
+    return {
+        "documentAuthenticity": "Valid",
+        "addressVerification": "Verified" if address and len(address) > 10 else "Pending",
+        "anomalyScore": f"{fraud_probability:.2f}"
     }
 
+# ======================================
+# WARMUP
+# ======================================
+def warmup():
+    start = time.perf_counter()
+    try:
+        predict_fraud("warmup", "000000000", "addr", "AADHAR")
+        predict_fraud_batch(["warmup"], ["000000000"], ["addr"], ["AADHAR"])
+        logger.info(f"🔥 Warmup finished in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except Exception as e:
+        logger.warning(f"⚠️ Warmup failed: {e}")
+
 # ======================================
 # APP STARTUP
 # ======================================
@@ -241,27 +590,41 @@ def startup_event():
     logger.info("🚀 Booting API...")
     ensure_gnn_csv()
     load_models()
+    prepare_transform()
+    prepare_fast_model()
     load_gnn()
+    _predict_fraud_cached.cache_clear()
+    try:
+        prepare_audit_log()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not prepare audit log: {e}")
+    start_audit_flusher()
+    if WARMUP:
+        warmup()
     logger.info("✅ Ready!")
 
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_audit_flusher()
+
 # ======================================
 # MAIN API ENDPOINT
 # ======================================
 @app.post("/api/verify-kyc", response_model=VerificationResponse)
 def verify(request: VerificationRequest):
     result = predict_fraud(request.name, request.documentNumber, request.address, request.documentType)
-    vid = f"VER{int(datetime.datetime.now().timestamp() * 1000)}"
-    ts = datetime.datetime.now().isoformat()
+    now = datetime.datetime.now()
+    vid = f"VER{int(now.timestamp() * 1000)}"
+    ts = now.isoformat()
     try:
-        df = pd.DataFrame([{
-            "Timestamp": ts,
-            "Name": request.name,
-            "ID_Type": request.documentType,
-            "Document_Number": request.documentNumber,
-            "Fraud_Risk": result["risk_level"],
-            "Fraud_Probability": result["fraud_probability"],
-        }])
-        df.to_csv(AUDIT_LOG, mode="a", header=not AUDIT_LOG.exists(), index=False)
+        write_audit_rows([[
+            ts,
+            request.name,
+            request.documentType,
+            request.documentNumber,
+            result["risk_level"],
+            result["fraud_probability"],
+        ]])
     except Exception as e:
         logger.warning(f"⚠️ Could not write audit log: {e}")
     return VerificationResponse(
@@ -273,14 +636,138 @@ def verify(request: VerificationRequest):
         fraudProbability=result["fraud_probability"],
         riskLevel=result["risk_level"],
         confidence=result["confidence"],
-        details={
-            "documentAuthenticity": "Valid",
-            "addressVerification": "Verified" if request.address and len(request.address) > 10 else "Pending",
-            "anomalyScore": f"{result['fraud_probability']:.2f}"
-        },
+        details=build_details(request.address, result["fraud_probability"]),
         message="KYC processed successfully."
     )
 
+# ======================================
+# BATCH API ENDPOINT
+# ======================================
+BATCH_REQUIRED_COLUMNS = ["name", "documentNumber", "documentType"]
+BATCH_CHUNK_SIZE = 10_000
+CSV_ERRORS = (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError)
+
+def process_batch_chunk(df, offset, ts, base_id):
+    # Ragged rows can leave trailing fields as NaN even with keep_default_na=False
+    df = df.reset_index(drop=True).fillna("")
+    if "address" not in df.columns:
+        df["address"] = ""
+
+    blank = df[BATCH_REQUIRED_COLUMNS].apply(lambda col: col.str.strip().eq(""))
+    valid = ~blank.any(axis=1)
+    ok = df[valid]
+
+    results = []
+    if not ok.empty:
+        probs, risks = predict_fraud_batch(ok["name"], ok["documentNumber"], ok["address"], ok["documentType"])
+        fraud_probs = probs * 100
+        try:
+            write_audit_rows(list(zip(
+                [ts] * len(ok),
+                ok["name"],
+                ok["documentType"],
+                ok["documentNumber"],
+                risks.tolist(),
+                fraud_probs.tolist(),
+            )))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write audit log: {e}")
+        for idx, row, fraud_prob, risk in zip(ok.index, ok.itertuples(index=False), fraud_probs, risks):
+            fraud_prob = float(fraud_prob)
+            results.append(BatchResultItem(
+                row=offset + idx + 1,
+                name=row.name,
+                documentNumber=row.documentNumber,
+                address=row.address,
+                documentType=row.documentType,
+                status="Flagged" if risk == "High" else "Verified",
+                id=f"VER{base_id}-{offset + idx + 1}",
+                timestamp=ts,
+                fraudProbability=fraud_prob,
+                riskLevel=str(risk),
+                confidence=100 - fraud_prob,
+                details=build_details(row.address, fraud_prob),
+                message="KYC processed successfully."
+            ))
+
+    for idx, row in df[~valid].iterrows():
+        missing_fields = ", ".join(blank.columns[blank.loc[idx]])
+        results.append(BatchResultItem(
+            row=offset + idx + 1,
+            name=row["name"],
+            documentNumber=row["documentNumber"],
+            address=row["address"],
+            documentType=row["documentType"],
+            status="Error",
+            id="",
+            timestamp=ts,
+            fraudProbability=0.0,
+            riskLevel="",
+            confidence=0.0,
+            details={},
+            message="Row skipped.",
+            error=f"Missing required field(s): {missing_fields}"
+        ))
+    results.sort(key=lambda item: item.row)
+    return results
+
+def iter_batch_results(first, reader):
+    now = datetime.datetime.now()
+    ts = now.isoformat()
+    base_id = int(now.timestamp() * 1000)
+    offset = 0
+    for chunk in itertools.chain([first], reader):
+        yield process_batch_chunk(chunk, offset, ts, base_id)
+        offset += len(chunk)
+
+@app.post("/api/verify-kyc-batch", response_model=BatchVerificationResponse)
+def verify_batch(file: UploadFile = File(...), stream: bool = False):
+    if not file.filename or not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Please upload a CSV file")
+    # The pyarrow engine does not support chunksize, so chunks come from the C parser
+    try:
+        reader = pd.read_csv(file.file, dtype=str, keep_default_na=False, chunksize=BATCH_CHUNK_SIZE)
+        first = next(reader, None)
+    except CSV_ERRORS as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse CSV: {e}")
+    if first is None:
+        raise HTTPException(status_code=400, detail="CSV file is empty")
+    missing = [c for c in BATCH_REQUIRED_COLUMNS if c not in first.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"CSV is missing column(s): {', '.join(missing)}")
+
+    if stream:
+        def ndjson():
+            # Headers are already sent, so failures can only be reported in-band
+            processed = 0
+            try:
+                for results in iter_batch_results(first, reader):
+                    for item in results:
+                        yield item.model_dump_json() + "\n"
+                    processed += len(results)
+            except CSV_ERRORS as e:
+                logger.error(f"❌ Batch stream aborted after {processed} rows: {e}")
+                yield json.dumps({"error": f"Could not parse CSV after row {processed}: {e}"}) + "\n"
+            except Exception:
+                logger.exception(f"❌ Batch stream failed after {processed} rows")
+                yield json.dumps({"error": f"Internal server error after row {processed}"}) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = []
+    try:
+        for chunk in iter_batch_results(first, reader):
+            results.extend(chunk)
+    except CSV_ERRORS as e:
+        # Rows before the bad chunk were already scored and audited; say how far we got
+        raise HTTPException(status_code=400, detail=f"Could not parse CSV after row {len(results)}: {e}")
+    failed = sum(1 for item in results if item.error)
+    return BatchVerificationResponse(
+        total=len(results),
+        successful=len(results) - failed,
+        failed=failed,
+        results=results
+    )
+
 # ======================================
 # ROOT CHECK
 # ======================================
@@ -291,7 +778,20 @@ def home():
         "model": "Loaded" if model else "Not Loaded",
         "scaler": "Loaded" if scaler else "Not Loaded",
         "selector": "Loaded" if feature_selector else "Not Loaded",
-        "gnn_csv": "Available" if not gnn_df.empty else "Empty"
+        "gnn_csv": "Available" if not gnn_df_empty else "Empty"
+    }
+
+# ======================================
+# PREDICTION CACHE STATS
+# ======================================
+@app.get("/admin/cache-stats")
+def cache_stats():
+    info = _predict_fraud_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "maxsize": info.maxsize,
+        "currsize": info.currsize
     }
 
 # ======================================
@@ -303,34 +803,39 @@ def test_prediction():
         {"name": "John Doe", "doc": "123456789", "address": "123 Main St", "dtype": "PASSPORT"},
         {"name": "Jane Smith", "doc": "987654321", "address": "456 Oak Ave", "dtype": "AADHAR"},
     ]
-    results = []
-    for test in test_cases:
-        X = extract_features(test["name"], test["doc"], test["address"], test["dtype"])
-        result = {"input": test, "features_shape": X.shape, "features": X.tolist()[0]}
-        if feature_selector:
-            try:
-                X_sel = feature_selector.transform(X)
-                result["after_selector_shape"] = X_sel.shape
-                result["after_selector"] = X_sel.tolist()[0]
-                X = X_sel
-            except Exception as e:
+    cases = pd.DataFrame(test_cases)
+    X = extract_features_batch(cases["name"], cases["doc"], cases["address"], cases["dtype"])
+    results = [
+        {"input": test, "features_shape": X[i:i + 1].shape, "features": X[i].tolist()}
+        for i, test in enumerate(test_cases)
+    ]
+    if feature_selector:
+        try:
+            X = feature_selector.transform(X)
+            for i, result in enumerate(results):
+                result["after_selector_shape"] = X[i:i + 1].shape
+                result["after_selector"] = X[i].tolist()
+        except Exception as e:
+            for result in results:
                 result["selector_error"] = str(e)
-        if scaler:
-            try:
-                X_scaled = scaler.transform(X)
-                result["after_scaler_shape"] = X_scaled.shape
-                result["after_scaler"] = X_scaled.tolist()[0]
-                X = X_scaled
-            except Exception as e:
+    if scaler:
+        try:
+            X = scaler.transform(X)
+            for i, result in enumerate(results):
+                result["after_scaler_shape"] = X[i:i + 1].shape
+                result["after_scaler"] = X[i].tolist()
+        except Exception as e:
+            for result in results:
                 result["scaler_error"] = str(e)
-        if model:
-            try:
-                proba = model.predict_proba(X)
-                result["model_proba_shape"] = proba.shape
-                result["model_proba"] = proba.tolist()[0]
-                result["fraud_prob"] = float(proba[0][1])
+    if model:
+        try:
+            proba = model.predict_proba(X)
+            for i, (test, result) in enumerate(zip(test_cases, results)):
+                result["model_proba_shape"] = proba[i:i + 1].shape
+                result["model_proba"] = proba[i].tolist()
+                result["fraud_prob"] = float(proba[i][1])
                 result["prediction"] = predict_fraud(test["name"], test["doc"], test["address"], test["dtype"])
-            except Exception as e:
+        except Exception as e:
+            for result in results:
                 result["model_error"] = str(e)
-        results.append(result)
     return {"model_loaded": model is not None, "scaler_loaded": scaler is not None, "selector_loaded": feature_selector is not None, "test_results": results}
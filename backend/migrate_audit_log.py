@@ -0,0 +1,60 @@
+"""
+Import the legacy kyc_audit_log.csv into the parquet audit dataset
+Run once from the backend directory: python migrate_audit_log.py
+"""
+import csv
+import os
+import sys
+
+import main
+
+LEGACY_CSV = main.BASE_DIR / "kyc_audit_log.csv"
+MARKER = main.AUDIT_DIR / ".legacy_csv_migrated"
+
+
+def read_legacy_rows(path):
+    """Read Timestamp, Name, ID_Type, Document_Number, risk and probability from the legacy CSV.
+
+    The first rows were written with an extra Confidence column and the rest without,
+    but the first six fields line up in both layouts.
+    """
+    rows, skipped = [], 0
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for fields in reader:
+            try:
+                ts, name, id_type, doc, risk, prob = fields[:6]
+                rows.append([ts, name, id_type, doc, risk, float(prob)])
+            except ValueError:
+                skipped += 1
+    return rows, skipped
+
+
+def migrate():
+    print(f"\n📦 Migrating {LEGACY_CSV.name} → {main.AUDIT_DIR.name}/")
+
+    if not LEGACY_CSV.exists():
+        print("   ❌ Legacy audit CSV not found, nothing to do")
+        return True
+    if MARKER.exists():
+        print("   ✅ Already migrated")
+        return True
+
+    rows, skipped = read_legacy_rows(LEGACY_CSV)
+    print(f"   📥 Read {len(rows)} rows ({skipped} malformed rows skipped)")
+
+    main.prepare_audit_log()
+    main.audit_rows.extend(rows)
+    if not main.flush_audit_log():
+        print("   ❌ Could not write parquet dataset, see log above")
+        return False
+
+    MARKER.write_text(f"{len(rows)} rows imported from {LEGACY_CSV.name}\n")
+    print(f"   ✅ Imported {len(rows)} rows")
+    return True
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(0 if migrate() else 1)
@@ -1,6 +1,7 @@
 import joblib
 import os
 import numpy as np
+import pandas as pd
 
 # ============================
 # MODEL FILE PATHS
@@ -16,6 +17,16 @@ model = joblib.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
 scaler = joblib.load(SCALER_PATH) if os.path.exists(SCALER_PATH) else None
 selector = joblib.load(SELECTOR_PATH) if os.path.exists(SELECTOR_PATH) else None
 
+# Resolve predict_proba vs predict once at load time instead of on every call
+if model is not None and hasattr(model, "predict_proba"):
+    _model_proba = model.predict_proba
+    predict_prob_fn = lambda X: _model_proba(X)[:, 1] * 100
+elif model is not None:
+    _model_predict = model.predict
+    predict_prob_fn = lambda X: np.where(_model_predict(X) == 1, 80, 20)
+else:
+    predict_prob_fn = None
+
 
 # ============================
 # FEATURE ENGINEERING (SAME AS MAIN BACKEND)
@@ -44,6 +55,33 @@ def extract_features(name, doc_number, address, doc_type):
     return np.array(features).reshape(1, -1)
 
 
+def extract_features_batch(names, doc_numbers, addresses, doc_types):
+    """
+    Vectorized extract_features over whole columns, returns an (N, 12) array.
+    """
+    names = pd.Series(names, dtype=object).fillna("").astype(str)
+    doc_numbers = pd.Series(doc_numbers, dtype=object).fillna("").astype(str)
+    addresses = pd.Series(addresses, dtype=object).fillna("").astype(str)
+    doc_types = pd.Series(doc_types, dtype=object).fillna("").astype(str)
+
+    return np.column_stack([
+        names.str.len().to_numpy(),
+        doc_numbers.str.len().to_numpy(),
+        addresses.str.len().to_numpy(),
+        doc_numbers.str.isdigit().to_numpy(np.int64),
+        doc_numbers.map(lambda s: len(set(s))).to_numpy(),
+        doc_types.eq("AADHAR").to_numpy(np.int64),
+        doc_types.eq("PAN").to_numpy(np.int64),
+        doc_types.eq("UTILITY").to_numpy(np.int64),
+        addresses.str.split().str.len().to_numpy(),
+        names.str.split().str.len().to_numpy(),
+        # Same per-character predicates as extract_features; regex/lower() shortcuts
+        # disagree on titlecase letters and non-decimal digits such as "²"
+        names.map(lambda s: any(x.isupper() for x in s)).to_numpy(np.int64),
+        names.map(lambda s: any(x.isdigit() for x in s)).to_numpy(np.int64),
+    ]).astype(np.int64)
+
+
 # ============================
 # RISK CLASSIFICATION
 # ============================
@@ -80,19 +118,10 @@ def run_model_prediction(
         X = scaler.transform(X)
 
     # Step 4: Prediction
-    if model is None:
+    if predict_prob_fn is None:
         raise ValueError("Model not loaded. Please ensure best_model.pkl exists.")
-    
-    # Type narrowing: model is guaranteed to be not None after the check above
-    assert model is not None, "Model should not be None at this point"
-    
-    if hasattr(model, "predict_proba"):
-        prob = model.predict_proba(X)[0][1] * 100
-    else:
-        pred = model.predict(X)[0]
-        prob = 80 if pred == 1 else 20
-
-    prob = round(prob, 2)
+
+    prob = round(float(predict_prob_fn(X)[0]), 2)
     risk = classify_risk(prob)
     confidence = round(100 - prob, 2)
 
@@ -103,6 +132,35 @@ def run_model_prediction(
     }
 
 
+def run_model_prediction_batch(names, doc_numbers, addresses, doc_types):
+    """
+    Same as run_model_prediction, but runs each pipeline stage once
+    on the stacked (N, 12) feature matrix.
+    """
+    X = extract_features_batch(names, doc_numbers, addresses, doc_types)
+
+    if selector is not None:
+        X = selector.transform(X)
+
+    if scaler is not None:
+        X = scaler.transform(X)
+
+    if predict_prob_fn is None:
+        raise ValueError("Model not loaded. Please ensure best_model.pkl exists.")
+
+    probs = predict_prob_fn(X)
+
+    results = []
+    for prob in np.round(probs, 2):
+        prob = float(prob)
+        results.append({
+            "fraud_probability": prob,
+            "fraud_risk": classify_risk(prob),
+            "confidence": round(100 - prob, 2)
+        })
+    return results
+
+
 # ============================
 # DEBUG RUN
 # ============================
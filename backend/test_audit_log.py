@@ -0,0 +1,118 @@
+"""
+Check the parquet audit log: buffering, retry after a failed write and ID_Type folding
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+import main
+
+
+def audit_row(name="John Doe", dtype="AADHAR", doc="123456789012"):
+    return ["2025-01-15T10:30:00", name, dtype, doc, "Low", 0.155]
+
+
+def reset_audit(audit_dir):
+    main.AUDIT_DIR = Path(audit_dir) / "audit_parquet"
+    main.audit_rows = []
+    main.audit_flush_failed = False
+    main.audit_dropped = 0
+    main.prepare_audit_log()
+
+
+def read_audit():
+    return pq.read_table(main.AUDIT_DIR).to_pandas().sort_values("Name").reset_index(drop=True)
+
+
+def check_flush(audit_dir):
+    print("\n🧪 Write and flush")
+    reset_audit(audit_dir)
+    main.write_audit_rows([audit_row("Ann"), audit_row("Bob", "PAN", "ABCDE1234F")])
+    ok = main.flush_audit_log() and not main.audit_rows
+    df = read_audit()
+    ok = ok and df["Name"].tolist() == ["Ann", "Bob"] and df["Document_Number"].tolist() == ["123456789012", "ABCDE1234F"]
+    print(f"   {'✅' if ok else '❌'} {len(df)} rows written")
+    return ok
+
+
+def check_retry(audit_dir):
+    print("\n🧪 Failed write is retried")
+    reset_audit(audit_dir)
+    # A plain file where the dataset root should be makes the write fail
+    main.AUDIT_DIR.rmdir()
+    main.AUDIT_DIR.write_text("")
+    main.write_audit_rows([audit_row("Ann")])
+    failed = not main.flush_audit_log() and main.audit_flush_failed and len(main.audit_rows) == 1
+    main.AUDIT_DIR.unlink()
+    retried = main.flush_audit_log() and not main.audit_flush_failed and not main.audit_rows
+    ok = failed and retried and read_audit()["Name"].tolist() == ["Ann"]
+    print(f"   {'✅' if ok else '❌'} failed={failed} retried={retried}")
+    return ok
+
+
+def check_bad_rows(audit_dir):
+    print("\n🧪 Unencodable row does not block the buffer")
+    reset_audit(audit_dir)
+    main.write_audit_rows([audit_row("\ud800"), audit_row("Bob")])
+    ok = main.flush_audit_log() and not main.audit_rows
+    names = read_audit()["Name"].tolist()
+    ok = ok and names == ["Bob", "\\ud800"]
+    print(f"   {'✅' if ok else '❌'} names={names!r}")
+    return ok
+
+
+def check_buffer_cap(audit_dir):
+    print("\n🧪 Buffer is capped while writes fail")
+    reset_audit(audit_dir)
+    main.audit_flush_failed = True
+    main.write_audit_rows([audit_row(str(i)) for i in range(main.AUDIT_MAX_BUFFERED + 5)])
+    ok = len(main.audit_rows) == main.AUDIT_MAX_BUFFERED and main.audit_dropped == 5 and main.audit_rows[0][1] == "5"
+    print(f"   {'✅' if ok else '❌'} buffered={len(main.audit_rows)} dropped={main.audit_dropped}")
+    main.audit_rows = []
+    return ok
+
+
+def check_id_type_folding(audit_dir):
+    print("\n🧪 ID_Type folding")
+    reset_audit(audit_dir)
+    main.write_audit_rows([audit_row("Ann", " pan "), audit_row("Bob", "../etc"), audit_row("Cy", None)])
+    ok = main.flush_audit_log()
+    partitions = sorted(p.name for p in main.AUDIT_DIR.iterdir())
+    df = read_audit()
+    ok = ok and partitions == ["ID_Type=OTHER", "ID_Type=PAN"]
+    ok = ok and df["ID_Type"].astype(str).tolist() == ["PAN", "OTHER", "OTHER"]
+    ok = ok and df["ID_Type_Raw"].tolist() == [" pan ", "../etc", None]
+    print(f"   {'✅' if ok else '❌'} partitions={partitions}")
+    return ok
+
+
+def test_flush(tmp_path):
+    assert check_flush(tmp_path)
+
+
+def test_retry(tmp_path):
+    assert check_retry(tmp_path)
+
+
+def test_bad_rows(tmp_path):
+    assert check_bad_rows(tmp_path)
+
+
+def test_buffer_cap(tmp_path):
+    assert check_buffer_cap(tmp_path)
+
+
+def test_id_type_folding(tmp_path):
+    assert check_id_type_folding(tmp_path)
+
+
+if __name__ == "__main__":
+    checks = [check_flush, check_retry, check_bad_rows, check_buffer_cap, check_id_type_folding]
+    ok = True
+    for check in checks:
+        with tempfile.TemporaryDirectory() as tmp:
+            ok = check(tmp) and ok
+    print("\n✅ Audit log OK" if ok else "\n❌ Audit log failed")
+    sys.exit(0 if ok else 1)
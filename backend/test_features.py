@@ -0,0 +1,74 @@
+"""
+Check that the batch feature extraction matches the single-row version
+"""
+import os
+import sys
+
+import numpy as np
+
+import main
+import predict
+
+SAMPLES = [
+    ("John Doe", "123456789012", "123 Main St, City", "AADHAR"),
+    ("jane smith", "ABCDE1234F", "", "PAN"),
+    ("ǅemal Ǆ", "A1B2", "Flat 3", "PASSPORT"),
+    ("x² y³", "²³", "road", "UTILITY"),
+    ("Ünal Çelik", "١٢٣", "İstanbul  Cd.", "OTHER"),
+    ("", "", "", ""),
+]
+
+
+def check_parity(name, single_fn, batch_fn):
+    print(f"\n🧪 {name}")
+    names, docs, addrs, dtypes = (list(col) for col in zip(*SAMPLES))
+    batch = batch_fn(names, docs, addrs, dtypes)
+    all_match = True
+    for i, sample in enumerate(SAMPLES):
+        single = np.asarray(single_fn(*sample), dtype=np.float64)[0]
+        if np.array_equal(single, batch[i]):
+            print(f"   ✅ {sample[0]!r}")
+        else:
+            print(f"   ❌ {sample[0]!r}: single={single.tolist()} batch={batch[i].tolist()}")
+            all_match = False
+    return all_match
+
+
+def check_fast_path():
+    """Numba kernel, when enabled with the shipped pickles, matches the sklearn pipeline"""
+    print("\n🧪 Numba fast path (shipped models)")
+    main.load_models()
+    main.prepare_transform()
+    main.prepare_fast_model()
+    if main.fast_params is None:
+        print("   ⚠️ Fast path not enabled (numba missing or model not eligible), skipping")
+        return True
+    assert main.model is not None
+    names, docs, addrs, dtypes = (list(col) for col in zip(*SAMPLES))
+    fast, _ = main.predict_fraud_batch(names, docs, addrs, dtypes)
+    X = main.extract_features_batch(names, docs, addrs, dtypes)
+    # Reference goes through the regular selector/scaler pipeline, whatever the shipped selector does
+    ref = main.model.predict_proba(main.transform_features(X))[:, 1]
+    single = np.array([main._predict_fraud_cached(*sample)[0] / 100 for sample in SAMPLES])
+    ok = np.allclose(fast, ref, atol=1e-5) and np.allclose(single, ref, atol=1e-5)
+    print(f"   {'✅' if ok else '❌'} max diff batch={np.abs(fast - ref).max():.2e} single={np.abs(single - ref).max():.2e}")
+    return ok
+
+
+def test_fast_path():
+    assert check_fast_path()
+
+
+def test_feature_parity():
+    """extract_features and extract_features_batch agree, including on Unicode input"""
+    assert check_parity("main.py", main.extract_features, main.extract_features_batch)
+    assert check_parity("predict.py", predict.extract_features, predict.extract_features_batch)
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    ok = check_parity("main.py", main.extract_features, main.extract_features_batch)
+    ok = check_parity("predict.py", predict.extract_features, predict.extract_features_batch) and ok
+    ok = check_fast_path() and ok
+    print("\n✅ Features match" if ok else "\n❌ Feature mismatch")
+    sys.exit(0 if ok else 1)
@@ -199,6 +199,58 @@ def test_cors():
         print(f"⚠️  CORS test failed: {e}")
         return True  # Not critical
 
+def test_batch_verification():
+    """Test 6: Test CSV Batch Verification API"""
+    print("\n" + "=" * 60)
+    print("TEST 6: CSV Batch Verification API")
+    print("=" * 60)
+    
+    header = "name,documentNumber,address,documentType\n"
+    csv_data = (
+        header
+        + "John Doe,123456789012,123 Main Street City,AADHAR\n"
+        + ",111111111111,Blank Name Road,PAN\n"
+        + "Ragged Row,222222222222\n"
+    )
+    
+    try:
+        response = requests.post(
+            f"{API_BASE_URL}/api/verify-kyc-batch",
+            files={"file": ("batch.csv", csv_data, "text/csv")}
+        )
+        if response.status_code != 200:
+            print(f"❌ Batch API returned status code: {response.status_code}")
+            print(f"   Response: {response.text}")
+            return False
+        
+        result = response.json()
+        rows = {item["row"]: item for item in result.get("results", [])}
+        print(f"   Total: {result.get('total')}, Successful: {result.get('successful')}, Failed: {result.get('failed')}")
+        
+        checks = {
+            "valid row scored": 1 in rows and not rows[1].get("error") and rows[1].get("riskLevel") in ("Low", "Medium", "High"),
+            "blank name rejected": 2 in rows and "name" in (rows[2].get("error") or ""),
+            "ragged row rejected": 3 in rows and "documentType" in (rows[3].get("error") or ""),
+            "counts": (result.get("total"), result.get("successful"), result.get("failed")) == (3, 1, 2),
+        }
+        
+        header_only = requests.post(
+            f"{API_BASE_URL}/api/verify-kyc-batch",
+            files={"file": ("empty.csv", header, "text/csv")}
+        )
+        checks["header-only CSV"] = (
+            header_only.status_code == 200
+            and header_only.json().get("total") == 0
+            and header_only.json().get("results") == []
+        )
+        
+        for check, passed in checks.items():
+            print(f"   {'✅' if passed else '❌'} {check}")
+        return all(checks.values())
+    except Exception as e:
+        print(f"❌ Batch API failed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("\n" + "=" * 60)
@@ -212,7 +264,8 @@ def main():
         "API Verification": False,
         "Model Prediction": False,
         "History API": False,
-        "CORS": False
+        "CORS": False,
+        "Batch Verification": False
     }
     
     # Test 1: Backend Status
@@ -249,6 +302,9 @@ def main():
     # Test 5: CORS
     results["CORS"] = test_cors()
     
+    # Test 6: CSV Batch Verification
+    results["Batch Verification"] = test_batch_verification()
+    
     # Summary
     print("\n" + "=" * 60)
     print("TEST SUMMARY")